@@ -59,6 +59,7 @@ class BaseParams(FieldInfo):
         self.deprecated = deprecated
         self.extra = extra
         self.dtype = type(default)
+        self.pydantic_class = None
         self._type = _type
         self.__gt = gt
         self.__ge = ge
@@ -1,17 +1,37 @@
+# cython: language_level=3, annotation_typing=False, boundscheck=False, wraparound=False
+import copy
 import enum
+import weakref
 import json
 import os
 import inspect
 import re
+import sys
 import typing as t
 import pydantic
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from flask import Flask, Blueprint, Response, jsonify, request, Request
 from flask.scaffold import _sentinel
 from functools import wraps
 from typing import Any, Callable, Dict, Mapping, List, Tuple, Type, Union, Optional
 from pydantic import BaseModel, create_model
 from werkzeug.datastructures import FileStorage
+from werkzeug.routing import UnicodeConverter
+
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class _OrjsonJSONProvider(DefaultJSONProvider):
+        """Parse request bodies with orjson when both orjson and flask's
+        provider hook (flask>=2.2) are available; serialization stays on
+        flask's default provider so response behavior is unchanged
+        """
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+except ImportError:
+    _OrjsonJSONProvider = None
+    DefaultJSONProvider = None
 
 from .responses import JSONResponse
 from .exceptions import SwaggerPathError
@@ -35,6 +55,236 @@ from .params import (
 )
 
 
+_DEFAULT_RESPONSES = {
+    "200": {
+        "description": "Successful Response",
+        "content": {
+            "application/json": {
+                "schema": {}
+            }
+        }
+    },
+    "422":{
+        "description": "ValidationError",
+        "content": {
+            "application/json": {
+                "example": {
+                    "detail": [
+                        {
+                        "loc": [
+                            "string"
+                        ],
+                        "msg": "string",
+                        "type": "string"
+                        }
+                    ]
+                }
+            }
+        }
+    }
+}
+
+_GET_ONLY = ("GET",)
+_DEFAULT_TAGS = ("default",)
+
+_RULE_PARAM_PATTERN = re.compile(r"<([^<>]*)>")
+_RULE_TYPED_PARAM_PATTERN = re.compile(r"<(?:[^<>:]*:)?([^<>]*)>")
+
+# interned bucket keys: every dict lookup and comparison on them hits
+# the pointer-equality fast path
+_PATH = sys.intern("path")
+_HEADER = sys.intern("header")
+_QUERY = sys.intern("query")
+_BODY = sys.intern("body")
+_FORM = sys.intern("form")
+_FILE = sys.intern("file")
+
+# param class -> alias bucket, looked up by exact type to skip the
+# isinstance ladder (the param classes are leaves of BaseParams)
+_ALIAS_BUCKET = {
+    Path: _PATH,
+    Header: _HEADER,
+    Query: _QUERY,
+    Body: _BODY,
+    Form: _FORM,
+    FormURLEncoded: _FORM,
+    File: _FILE
+}
+
+# frozensets of the leaf classes for O(1) exact-type membership; the
+# isinstance fallbacks stay for subclassed param objects
+_FORM_TYPES = frozenset(_FormClasses)
+_BODY_TYPES = frozenset(_BodyClasses)
+
+RouteCtx = namedtuple(
+    "RouteCtx",
+    "vars query_names header_names form_names file_names total_body "
+    "body_keys body_aliases body_pydantic "
+    "required_fields construct_ok get_model post_model security"
+)
+"""Per-route context computed once at decoration time and read on every request.
+
+- `vars`: frozenset of the endpoint pydantic model field names
+- `query_names`/`header_names`/`form_names`/`file_names`: resolved alias names per source
+- `total_body`: how many `Body` params the endpoint declares
+- `body_keys`/`body_aliases`/`body_pydantic`: parallel tuples holding each `Body`
+  param's key, alias (or key) and resolved pydantic class (or `None`)
+- `required_fields`: frozenset of field names without a usable default
+- `construct_ok`: whether validation can be skipped via `model.construct`
+- `get_model`/`post_model`: endpoint pydantic models without/with body constraints
+- `security`: the endpoint's security scheme, if any
+"""
+
+
+class _LazyEndpointModel():
+    """Defers `pydantic.create_model` for an endpoint until the first
+    request needs it, since model compilation dominates decoration cost
+    """
+    __slots__ = ("_router", "_name", "_paired_params", "_with_body", "_model")
+
+    def __init__(self, router, name: str, paired_params: Dict[str, ParamSignature], with_body: bool):
+        # weak so an endpoint definition never keeps its router alive
+        # through the model it carries
+        self._router = weakref.ref(router)
+        self._name = name
+        self._paired_params = paired_params
+        self._with_body = with_body
+        self._model = None
+
+    def resolve(self) -> BaseSchema:
+        model = self._model
+        if model is None:
+            router = self._router()
+            if router is None:
+                raise RuntimeError(
+                    f"cannot compile '{self._name}', its router was garbage collected"
+                )
+            model = router.generate_endpoint_pydantic(
+                self._name, self._paired_params, with_body=self._with_body
+            )
+            # the construct fast path must never skip user validators;
+            # double-check the compiled fields and let the model veto it
+            model._validator_free = not any(
+                f.class_validators or f.pre_validators or f.post_validators
+                for f in model.__fields__.values()
+            )
+            self._model = model
+        return model
+
+
+class _RadixNode():
+    """Single node of the URL radix tree. Static children are keyed by
+    path segment while dynamic segments share one `param_child`
+    """
+    __slots__ = ("children", "param_child", "param_name", "rules")
+
+    def __init__(self):
+        self.children = {}
+        self.param_child = None
+        self.param_name = None
+        self.rules = []
+
+
+class _RadixTree():
+    """Radix tree over the app's url map so route matching costs
+    O(path segments) instead of werkzeug's O(registered rules)
+
+    Only plain rules are inserted (default string converters, no
+    subdomain/host/defaults); anything else stays on werkzeug's matcher
+    """
+
+    def __init__(self):
+        self.root = _RadixNode()
+        self.size = 0
+
+    def rebuild(self, rules):
+        self.root = _RadixNode()
+        self.size = len(rules)
+        for rule in rules:
+            self.insert(rule)
+
+    def insert(self, rule) -> bool:
+        if (
+            rule.build_only
+            or rule.defaults
+            or rule.subdomain
+            or rule.host
+            or getattr(rule, "websocket", False)
+        ):
+            return False
+        for converter in rule._converters.values():
+            if type(converter) != UnicodeConverter:
+                return False
+
+        node = self.root
+        for segment in rule.rule.split("/"):
+            if "<" in segment or ">" in segment:
+                if not (segment[0] == "<" and segment[-1] == ">" and segment.count("<") == 1 and segment.count(">") == 1):
+                    return False
+                name = segment[1:-1]
+                if node.param_child is None:
+                    node.param_child = _RadixNode()
+                    node.param_name = name
+                elif node.param_name != name:
+                    # conflicting param names cannot share one node,
+                    # keep such rules on werkzeug's matcher
+                    return False
+                node = node.param_child
+            else:
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _RadixNode()
+                node = child
+        node.rules.append(rule)
+        return True
+
+    def match(self, path: str, method: str):
+        node = self.root
+        args = {}
+        for segment in path.split("/"):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.param_child
+                if child is None or not segment:
+                    return None
+                args[node.param_name] = segment
+            node = child
+        for rule in node.rules:
+            if rule.methods is None or method in rule.methods:
+                return rule, args
+        return None
+
+
+class _RadixMapAdapter():
+    """Thin proxy around werkzeug's `MapAdapter` that consults the radix
+    tree first and only falls back to the linear matcher on a miss
+    """
+    __slots__ = ("_adapter", "_tree")
+
+    def __init__(self, adapter, tree: _RadixTree):
+        self._adapter = adapter
+        self._tree = tree
+
+    def match(self, path_info=None, method=None, return_rule=False, query_args=None, websocket=False):
+        # the tree only holds subdomain-less rules, so it must not answer
+        # for adapters bound to a non-default subdomain
+        if return_rule and not websocket and not self._adapter.subdomain:
+            path = path_info if path_info is not None else self._adapter.path_info
+            matched = self._tree.match(
+                "/" + path.lstrip("/"),
+                (method or self._adapter.default_method).upper()
+            )
+            if matched:
+                return matched
+        return self._adapter.match(
+            path_info, method, return_rule=return_rule,
+            query_args=query_args, websocket=websocket
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._adapter, name)
+
+
 class EndpointDefinition():
     """Define endpoint's properties that will be generated by `AutoSwagger`
 
@@ -59,9 +309,11 @@ class EndpointDefinition():
                 "parameters": [],
                 "responses": {}
             }
-    :param pydantic_model: 
+    :param pydantic_model:
     """
-    _all_endpoints: Type["EndpointDefinition"] = []
+    # weak keys so a dropped router releases its definitions instead of
+    # pinning them (and its models/handlers) for the process lifetime
+    _by_router: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
 
     def __init__(
         self,
@@ -77,7 +329,8 @@ class EndpointDefinition():
         custom_swagger: Optional[Dict[str, Any]] = None,
         pydantic_model: BaseModel = None,
         security: Optional[HTTPSecurityBase] = None,
-        aliases: Optional[Dict[str, Dict[str, str]]] = []
+        aliases: Optional[Dict[str, Dict[str, str]]] = None,
+        router: Optional["APIRouter"] = None
     ) -> None:
         self.rule = rule
         self.method = method.lower()
@@ -94,35 +347,22 @@ class EndpointDefinition():
         if responses:
             self.responses = responses
         else:
-            self.responses = {
-                "200": {
-                    "description": "Successful Response",
-                    "content": {
-                        "application/json": {
-                            "schema": {}
-                        }
-                    }
-                },
-                "422":{
-                    "description": "ValidationError",
-                    "content": {
-                        "application/json": {
-                            "example": {
-                                "detail": [
-                                    {
-                                    "loc": [
-                                        "string"
-                                    ],
-                                    "msg": "string",
-                                    "type": "string"
-                                    }
-                                ]
-                            }
-                        }
-                    }
-                }
-            }
-        EndpointDefinition._all_endpoints.append(self)
+            # each endpoint gets its own copy so user code can tweak one
+            # endpoint's responses without editing every other endpoint
+            self.responses = copy.deepcopy(_DEFAULT_RESPONSES)
+        if router is not None:
+            EndpointDefinition._by_router.setdefault(router, []).append(self)
+
+    @classmethod
+    def for_app(cls, app: Flask) -> List["EndpointDefinition"]:
+        """Collect the endpoint definitions of every `APIRouter`
+        registered on `app`
+        """
+        endpoints = []
+        for bp in app.blueprints.values():
+            if isinstance(bp, APIRouter):
+                endpoints.extend(cls._by_router.get(bp, []))
+        return endpoints
 
 
 class APIRouter(Blueprint):
@@ -178,10 +418,10 @@ class APIRouter(Blueprint):
         url_defaults: Optional[dict] = None,
         root_path: Optional[str] = None,
         cli_group: Optional[str] = _sentinel,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         auto_swagger: bool = True,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = []
+        dependencies: Optional[List[Callable]] = None
     ):
         super().__init__(
             name=name,
@@ -201,10 +441,11 @@ class APIRouter(Blueprint):
         self.defined_endpoints: List[EndpointDefinition] = []
         self._is_registered = False
         self._enable_auto_swagger = auto_swagger
-        self.tags = tags
+        self.tags = list(tags) if tags else []
         self.security = security
-        self.dependecies = dependencies
-        self.available_methods = ["GET", "POST", "PUT", "DELETE", "PATCH"]
+        self.dependecies = list(dependencies) if dependencies else []
+        self._dependencies_set = set(self.dependecies)
+        self.available_methods = frozenset(("GET", "POST", "PUT", "DELETE", "PATCH"))
 
     def register(self, app: Flask, options: dict) -> None:
         name_prefix = options.get("name_prefix", "")
@@ -314,10 +555,40 @@ class APIRouter(Blueprint):
             bp_options["name_prefix"] = name
             blueprint.register(app, bp_options)
 
+        self._install_radix_matcher(app)
+        if (
+            _OrjsonJSONProvider is not None
+            and type(app.json) is DefaultJSONProvider
+        ):
+            # only swap flask's stock provider; a user-customized one
+            # (or an already-installed orjson provider) is left alone
+            app.json = _OrjsonJSONProvider(app)
+
+    def _install_radix_matcher(self, app: Flask) -> None:
+        """Swap the app's url adapter with a radix-tree backed one.
+        The tree is rebuilt lazily whenever the url map grew, so rules
+        registered by later blueprints are picked up as well
+        """
+        if getattr(app, "_radix_tree", None) is not None:
+            return
+        app._radix_tree = _RadixTree()
+        original_create_url_adapter = app.create_url_adapter
+
+        def create_url_adapter(request):
+            adapter = original_create_url_adapter(request)
+            if adapter is None or request is None:
+                return adapter
+            tree = app._radix_tree
+            if tree.size != len(app.url_map._rules):
+                tree.rebuild(app.url_map._rules)
+            return _RadixMapAdapter(adapter, tree)
+
+        app.create_url_adapter = create_url_adapter
+
     def get(
         self,
         rule: str,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         description: Optional[str] = None,
         response_description: str = "Successful Response",
@@ -325,7 +596,7 @@ class APIRouter(Blueprint):
         auto_swagger: bool = True,
         custom_swagger: Optional[Dict[str, Any]] = None,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = [],
+        dependencies: Optional[List[Callable]] = None,
         **options: Any
     ) -> Callable:
         return self._method_route(
@@ -336,7 +607,7 @@ class APIRouter(Blueprint):
     def post(
         self,
         rule: str,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         description: Optional[str] = None,
         response_description: str = "Successful Response",
@@ -344,7 +615,7 @@ class APIRouter(Blueprint):
         auto_swagger: bool = True,
         custom_swagger: Optional[Dict[str, Any]] = None,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = [],
+        dependencies: Optional[List[Callable]] = None,
         **options: Any
     ) -> Callable:
         return self._method_route(
@@ -355,7 +626,7 @@ class APIRouter(Blueprint):
     def put(
         self,
         rule: str,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         description: Optional[str] = None,
         response_description: str = "Successful Response",
@@ -363,7 +634,7 @@ class APIRouter(Blueprint):
         auto_swagger: bool = True,
         custom_swagger: Optional[Dict[str, Any]] = None,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = [],
+        dependencies: Optional[List[Callable]] = None,
         **options: Any
     ) -> Callable:
         return self._method_route(
@@ -374,7 +645,7 @@ class APIRouter(Blueprint):
     def delete(
         self,
         rule: str,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         description: Optional[str] = None,
         response_description: str = "Successful Response",
@@ -382,7 +653,7 @@ class APIRouter(Blueprint):
         auto_swagger: bool = True,
         custom_swagger: Optional[Dict[str, Any]] = None,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = [],
+        dependencies: Optional[List[Callable]] = None,
         **options: Any
     ) -> Callable:
         return self._method_route(
@@ -393,7 +664,7 @@ class APIRouter(Blueprint):
     def patch(
         self,
         rule: str,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         description: Optional[str] = None,
         response_description: str = "Successful Response",
@@ -401,7 +672,7 @@ class APIRouter(Blueprint):
         auto_swagger: bool = True,
         custom_swagger: Optional[Dict[str, Any]] = None,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = [],
+        dependencies: Optional[List[Callable]] = None,
         **options: Any
     ) -> Callable:
         return self._method_route(
@@ -414,7 +685,7 @@ class APIRouter(Blueprint):
         method: str,
         rule: str,
         options: dict,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         description: Optional[str] = None,
         response_description: str = "Successful Response",
@@ -422,7 +693,7 @@ class APIRouter(Blueprint):
         auto_swagger: bool = True,
         custom_swagger: Optional[Dict[str, Any]] = None,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = []
+        dependencies: Optional[List[Callable]] = None
     ) -> Callable:
         if "methods" in options:
             raise TypeError("Use the 'route' decorator to use the 'methods' argument")
@@ -447,7 +718,7 @@ class APIRouter(Blueprint):
         endpoint: t.Optional[str] = None,
         view_func: t.Optional[t.Callable] = None,
         provide_automatic_options: t.Optional[bool] = None,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         description: Optional[str] = None,
         response_description: str = "Successful Response",
@@ -455,12 +726,12 @@ class APIRouter(Blueprint):
         auto_swagger: bool = True,
         custom_swagger: Optional[Dict[str, Any]] = None,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = [],
+        dependencies: Optional[List[Callable]] = None,
         **options: t.Any
     ) -> None:
         self.route(
             rule=rule,
-            methods=options.pop("methods", ["GET"]),
+            methods=options.pop("methods", None) or _GET_ONLY,
             endpoint=endpoint,
             provide_automatic_options=provide_automatic_options,
             tags=tags,
@@ -478,7 +749,7 @@ class APIRouter(Blueprint):
     def route(
         self,
         rule: str,
-        tags: Optional[List[str]] = [],
+        tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         description: Optional[str] = None,
         response_description: str = "Successful Response",
@@ -486,7 +757,7 @@ class APIRouter(Blueprint):
         auto_swagger: bool = True,
         custom_swagger: Optional[Dict[str, Any]] = None,
         security: Optional[HTTPSecurityBase] = None,
-        dependencies: Optional[List[Callable]] = [],
+        dependencies: Optional[List[Callable]] = None,
         **options: Any
     ) -> Callable:
 
@@ -495,88 +766,138 @@ class APIRouter(Blueprint):
         assert (self.url_prefix+rule)[0] == "/", f"path rule must starts with '/' -> {rule}"
 
         security = self.security if not security else security
-        
-        self.update_dependencies(dependencies)
+
+        tags = tags or []
+        if dependencies:
+            self.update_dependencies(dependencies)
         
         def decorator(func: Callable) -> Callable:
             paired_params = self._get_func_signature(rule, func)
             aliases = self.get_params_aliases(paired_params)
             self.paired_signature[self.url_prefix+rule] = paired_params
+            self.aliases[self.url_prefix+rule] = aliases
 
-            pydantic_model_no_body = self.generate_endpoint_pydantic(
-                func.__name__+"Schema_no_Body", paired_params, with_body=False
+            pydantic_model_no_body = _LazyEndpointModel(
+                self, func.__name__+"Schema_no_Body", paired_params, with_body=False
             )
-            pydantic_model = self.generate_endpoint_pydantic(
-                func.__name__+"Schema", paired_params, with_body=True
+            pydantic_model = _LazyEndpointModel(
+                self, func.__name__+"Schema", paired_params, with_body=True
+            )
+            ctx = self._build_route_ctx(
+                rule, paired_params, aliases, pydantic_model_no_body, pydantic_model, security
             )
 
-            def create_modified_func():
-                @wraps(func)
-                def modified_func(**paths):
-                    try:
-                        req = security(request) if security else request
-                        if req.method == "GET":
-                            valid_kwargs = self.get_kwargs(
-                                paths, req, paired_params, pydantic_model_no_body, aliases
+            def create_modified_func(lazy_model):
+                # routes without body/form/file params get a generated
+                # view specialized to their exact signature
+                specialized = self._codegen_view(func, ctx, lazy_model, security)
+                if specialized is not None:
+                    return specialized
+                # two closure variants so routes without security never
+                # pay for the check; the context is captured in closure
+                # cells so path params can never shadow it
+                if not security:
+                    @wraps(func)
+                    def modified_func(**paths):
+                        try:
+                            valid_kwargs = self.get_kwargs(paths, request, ctx, lazy_model.resolve())
+                        except pydantic.ValidationError as e:
+                            return JSONResponse(
+                                response=e.errors(),
+                                status_code=422
                             )
-                        else:
-                            valid_kwargs = self.get_kwargs(
-                                paths, req, paired_params, pydantic_model, aliases
+                        return func(**valid_kwargs)
+                else:
+                    @wraps(func)
+                    def modified_func(**paths):
+                        try:
+                            valid_kwargs = self.get_kwargs(paths, security(request), ctx, lazy_model.resolve())
+                        except pydantic.ValidationError as e:
+                            return JSONResponse(
+                                response=e.errors(),
+                                status_code=422
                             )
                         return func(**valid_kwargs)
-                    except pydantic.ValidationError as e:
-                        return JSONResponse(
-                            response=e.errors(),
-                            status_code=422
-                        )
-                    except Exception as e:
-                        raise e
                 return modified_func
 
+            methods = options.pop("methods", None) or _GET_ONLY
+            for http_method in methods:
+                if http_method.upper() not in self.available_methods:
+                    raise Exception(
+                        f"Invalid Type of HTTP Method, expected between or/and : {sorted(self.available_methods)}"
+                    )
+
             # register endpoint
-            f = create_modified_func()
+            # the pydantic model is picked per declared method at decoration
+            # time so the view never branches on request.method
             endpoint = options.pop("endpoint", None)
-            Blueprint.add_url_rule(self, rule, endpoint, f, **options)
+            get_methods = [m for m in methods if m.upper() == "GET"]
+            body_methods = [m for m in methods if m.upper() != "GET"]
+            if not body_methods:
+                f = create_modified_func(ctx.get_model)
+                Blueprint.add_url_rule(self, rule, endpoint, f, methods=methods, **options)
+            elif not get_methods:
+                f = create_modified_func(ctx.post_model)
+                Blueprint.add_url_rule(self, rule, endpoint, f, methods=methods, **options)
+            else:
+                # mixed route: the GET view keeps the base endpoint name so
+                # url_for stays valid, body methods get a suffixed endpoint
+                f = create_modified_func(ctx.get_model)
+                Blueprint.add_url_rule(self, rule, endpoint, f, methods=get_methods, **options)
+                for http_method in body_methods:
+                    f = create_modified_func(ctx.post_model)
+                    Blueprint.add_url_rule(
+                        self, rule,
+                        f"{endpoint or func.__name__}__{http_method.lower()}",
+                        f, methods=[http_method], **options
+                    )
 
             # register autoswagger
-            for http_method in options.get("methods", ["GET"]):
-                if http_method.upper() not in self.available_methods:
-                    raise Exception(
-                        f"Invalid Type of HTTP Method, expected between or/and : {self.available_methods}"
+            # custom swagger definitions are still emitted when the
+            # automatic one is disabled
+            swagger_enabled = bool(self._enable_auto_swagger and auto_swagger)
+            if swagger_enabled or custom_swagger:
+                for http_method in methods:
+                    defined_ep = EndpointDefinition(
+                        rule=self.validate_rule_for_swagger(self.url_prefix+rule),
+                        method=http_method,
+                        paired_params=paired_params,
+                        tags=tuple(tags) + tuple(self.tags) or _DEFAULT_TAGS,
+                        summary=summary if summary else func.__name__,
+                        description=description if description else func.__name__,
+                        response_description=response_description,
+                        responses=responses,
+                        auto_swagger=swagger_enabled,
+                        custom_swagger=custom_swagger,
+                        pydantic_model=pydantic_model,
+                        security=security,
+                        aliases=aliases,
+                        router=self
                     )
-
-                defined_ep = EndpointDefinition(
-                    rule=self.validate_rule_for_swagger(self.url_prefix+rule),
-                    method=http_method,
-                    paired_params=paired_params,
-                    tags=tags+self.tags or ["default"],
-                    summary=summary if summary else func.__name__,
-                    description=description if description else func.__name__,
-                    response_description=response_description,
-                    responses=responses,
-                    auto_swagger=self._enable_auto_swagger & auto_swagger,
-                    custom_swagger=custom_swagger,
-                    pydantic_model=pydantic_model,
-                    security=security,
-                    aliases=aliases
-                )
-                self.defined_endpoints.append(defined_ep)
+                    self.defined_endpoints.append(defined_ep)
             return func
 
         return decorator
 
     def fill_all_enum_value(self, o):
-        try:
-            datas = {}
-            if type(o) == dict:
-                for k in o:
-                    datas[k] = self.fill_all_enum_value(o[k])
-                return datas
-            if enum.Enum.__subclasscheck__(o.__class__):
-                return o.value
-        except:
+        if isinstance(o, enum.Enum):
+            return o.value
+        if not isinstance(o, dict):
             return o
-        return o
+        # iterative walk: one isinstance per node, no recursion frames
+        datas = {}
+        stack = [(o, datas)]
+        while stack:
+            src, dst = stack.pop()
+            for k, v in src.items():
+                if isinstance(v, dict):
+                    dst[k] = child = {}
+                    stack.append((v, child))
+                elif isinstance(v, enum.Enum):
+                    dst[k] = v.value
+                else:
+                    dst[k] = v
+        return datas
     
     def generate_endpoint_pydantic(self, name: str, paired_params: Dict[str, ParamSignature], with_body: bool = True):
         params = {
@@ -585,21 +906,159 @@ class APIRouter(Blueprint):
         }
         if not with_body:
             for key in params:
-                if isinstance(params[key][1], _BodyClasses):
-                    params[key][1].disable_constraint()
+                po = params[key][1]
+                if type(po) in _BODY_TYPES or isinstance(po, _BodyClasses):
+                    po.disable_constraint()
         return create_model(name, __base__=BaseSchema, **params)
 
+    def _codegen_view(
+        self,
+        func: Callable,
+        ctx: RouteCtx,
+        lazy_model: _LazyEndpointModel,
+        security: Optional[HTTPSecurityBase]
+    ) -> Optional[Callable]:
+        """Generate a view function specialized to the route's exact
+        params by exec'ing route-specific source, removing the generic
+        per-request loops entirely. Routes with body, form or file
+        params keep the generic closure
+        """
+        if ctx.total_body or ctx.form_names or ctx.file_names:
+            return None
+
+        src = [
+            "def modified_func(**paths):",
+            "    kwargs = paths",
+            "    try:"
+        ]
+        if security:
+            src.append("        req = security(request)")
+            source = "req"
+        else:
+            source = "request"
+        if ctx.query_names:
+            src.append(f"        queries = {source}.args")
+            for name in ctx.query_names:
+                src.append(f"        if {name!r} in queries: kwargs[{name!r}] = queries[{name!r}]")
+        if ctx.header_names:
+            src.append(f"        headers = {source}.headers")
+            for i, name in enumerate(ctx.header_names):
+                src.append(f"        v{i} = headers.get({name!r})")
+                src.append(f"        if v{i}: kwargs[{name!r}] = v{i}")
+        src.append("        model = lazy_model.resolve()")
+        if ctx.construct_ok:
+            src.append("        if not model._validator_free or required_fields - kwargs.keys():")
+            src.append("            valid_kwargs = model(**kwargs)")
+            src.append("        else:")
+            src.append("            valid_kwargs = model.construct(**kwargs)")
+        else:
+            src.append("        valid_kwargs = model(**kwargs)")
+        src.append("    except ValidationError as e:")
+        src.append("        return JSONResponse(response=e.errors(), status_code=422)")
+        src.append("    return func(**valid_kwargs.__dict__)")
+
+        namespace = {
+            "request": request,
+            "security": security,
+            "lazy_model": lazy_model,
+            "required_fields": ctx.required_fields,
+            "ValidationError": pydantic.ValidationError,
+            "JSONResponse": JSONResponse,
+            "func": func
+        }
+        code = compile("\n".join(src), f"<generated view: {func.__name__}>", "exec")
+        exec(code, namespace)
+        return wraps(func)(namespace["modified_func"])
+
+    def _build_route_ctx(
+        self,
+        rule: str,
+        paired_params: Dict[str, ParamSignature],
+        aliases: Dict[str, Dict[str, str]],
+        pydantic_model_no_body: _LazyEndpointModel,
+        pydantic_model: _LazyEndpointModel,
+        security: Optional[HTTPSecurityBase]
+    ) -> RouteCtx:
+        """Precompute everything `get_kwargs` needs so no signature analysis
+        happens on the request hot path
+        """
+        variables = list(paired_params.keys())
+        body_keys = []
+        body_aliases = []
+        body_pydantic = []
+        for key, pp in paired_params.items():
+            po = pp.param_object
+            if isinstance(po, Body):
+                pydantic_class = self.get_pydantic_from_annots(po.dtype)
+                if not (isinstance(pydantic_class, type) and issubclass(pydantic_class, BaseModel)):
+                    pydantic_class = None
+                po.pydantic_class = pydantic_class
+                body_keys.append(sys.intern(key))
+                body_aliases.append(sys.intern(po.alias or key))
+                body_pydantic.append(pydantic_class)
+
+        # pydantic validation is skippable only when it provably cannot
+        # change anything: plain str/Any fields, no aliases, no value
+        # constraints and no JSON body to coerce; every rule path param
+        # must also be declared by the function, since construct keeps
+        # extra kwargs that validation would drop
+        construct_ok = not body_keys and not (
+            frozenset(_RULE_TYPED_PARAM_PATTERN.findall(rule)) - paired_params.keys()
+        )
+        for pp in paired_params.values():
+            if not construct_ok:
+                break
+            po = pp.param_object
+            if (
+                pp._type not in (str, Any)
+                or po.alias is not None
+                or po.gt is not None or po.ge is not None
+                or po.lt is not None or po.le is not None
+                or po.min_length is not None or po.max_length is not None
+                or po.regex is not None
+            ):
+                construct_ok = False
+
+        return RouteCtx(
+            vars=frozenset(variables),
+            query_names=tuple(map(sys.intern, self.convert_alias_to_name(aliases[_QUERY], variables))),
+            header_names=tuple(map(sys.intern, self.convert_alias_to_name(aliases[_HEADER], variables))),
+            form_names=tuple(map(sys.intern, self.convert_alias_to_name(aliases[_FORM], variables))),
+            file_names=tuple(map(sys.intern, self.convert_alias_to_name(aliases[_FILE], variables))),
+            total_body=len(body_keys),
+            body_keys=tuple(body_keys),
+            body_aliases=tuple(body_aliases),
+            body_pydantic=tuple(body_pydantic),
+            required_fields=frozenset(
+                k for k, pp in paired_params.items() if pp.param_object.default is ...
+            ),
+            construct_ok=construct_ok,
+            get_model=pydantic_model_no_body,
+            post_model=pydantic_model,
+            security=security
+        )
+
     def _get_func_signature(self, path: str, func: Callable) -> Dict[str, ParamSignature]:
         params_signature = inspect.signature(func).parameters
         annots = func.__annotations__
         pair = {}
 
+        ## extract path params once instead of scanning the rule per param
+        path_param_names = _RULE_PARAM_PATTERN.findall(path)
+        path_params = frozenset(path_param_names)
+        duplicated_params = {
+            name for name in path_params if path_param_names.count(name) > 1
+        }
+
         ## get params signature pair from function
         for k, p in params_signature.items():
+            ## interned names hit the dict pointer-compare fast path on
+            ## every per-request lookup
+            k = sys.intern(k)
             ## get default value
             if p.default != inspect._empty:
-                if type(p.default) not in _ParamsClasses:
-                    if type(p.default) == Depends:
+                if not isinstance(p.default, _ParamsClasses):
+                    if isinstance(p.default, Depends):
                         try:
                             if k not in annots:
                                 annots[k] = str
@@ -619,22 +1078,26 @@ class APIRouter(Blueprint):
                 default_value = Query(...)
 
             ## check path params
-            if self.check_params_in_path(k, path):
+            if k in path_params:
+                if k in duplicated_params:
+                    error = f"Invalid path. multiple '{k}' appeared in : {path}"
+                    raise SwaggerPathError(error)
                 default_value = Path(default_value.default)
             
             ## get default type
+            is_form = type(default_value) in _FORM_TYPES or isinstance(default_value, _FormClasses)
             if k in annots:
                 default_type = annots[k]
-                if type(default_value) in _FormClasses:
+                if is_form:
                     default_type = str if default_type == FileStorage else default_type
             else:
-                if type(default_value) in _FormClasses:
+                if is_form:
                     default_type = Any
                 else:
                     default_type = str
-            
+
             ## check pydantic annots
-            if type(default_value) not in _FormClasses:
+            if not is_form:
                 default_value = self.define_body_from_annots(default_value, default_type)
 
             pair[k] = ParamSignature(k, default_type, default_value)
@@ -654,172 +1117,148 @@ class APIRouter(Blueprint):
             return default_value
     
     def get_pydantic_from_annots(self, annot):
-        try:
-            if BaseModel.__subclasscheck__(annot):
-                return annot
-        except:
-            pass
+        if isinstance(annot, type) and issubclass(annot, BaseModel):
+            return annot
         if annot.__class__ in [t._GenericAlias, t._SpecialForm]:
-            for a in annot.__args__:
+            for a in t.get_args(annot):
                 b = self.get_pydantic_from_annots(a)
                 return b if b else annot
 
     def validate_rule_for_swagger(self, rule: str):
-        opening_found = False
-        new_rule = ""
-        for i in range(len(rule)):
-            if not opening_found and rule[i] == "<":
-                opening_found = True
-                new_rule += "{"
-                continue
-            if opening_found and rule[i] == ">":
-                opening_found = False
-                new_rule += "}"
-                continue
-            new_rule += rule[i]
-        return new_rule
-    
+        return _RULE_PARAM_PATTERN.sub(r"{\1}", rule)
+
     def validate_rule(self, rule: str):
-        pattern = re.compile(r"[<]{1}[^<>]*[>]{1}")
-        for text in pattern.findall(rule):
+        for text in _RULE_PARAM_PATTERN.findall(rule):
             assert text.count(":") in [0,1], f"Multiple type definition using ':' in path -> {rule}"
-
-        new_rule = ""
-        start_write_path = False
-        start_path = []
-        for c in rule:
-            if c == "<":
-                start_path.append("")
-                start_write_path = True
-            elif c == ">":
-                if start_path[-1].count(":"):
-                    start_path[-1] = start_path[-1][start_path[-1].index(":")+1:]
-                start_write_path = False
-                new_rule += "<" + start_path[-1] + ">"
-            else:
-                if not start_write_path:
-                    new_rule += c
-                else:
-                    start_path[-1] += c
-        return new_rule
+        return _RULE_TYPED_PARAM_PATTERN.sub(r"<\1>", rule)
 
     def get_kwargs(
         self,
         paths: Dict[str, Any],
         request: Request,
-        paired_params: Dict[str, ParamSignature],
-        pydantic_model: BaseSchema,
-        aliases: Dict[str, str]
+        ctx: RouteCtx,
+        pydantic_model: BaseSchema
     ):
         """Get keyword args that will be passed to the function
         """
+        method = request.method
+
         # path
-        variables = pydantic_model.__fields__.keys()
         kwargs = {**paths}
 
         # query
-        queries = request.args.to_dict()
-        query_kwargs = {k: queries[k] for k in self.convert_alias_to_name(aliases["query"], variables) if k in queries}
-        kwargs.update(query_kwargs)
+        queries = request.args
+        for k in ctx.query_names:
+            if k in queries:
+                kwargs[k] = queries[k]
 
         # header
-        header_kwargs = {k: request.headers.get(k) for k in self.convert_alias_to_name(aliases["header"], variables) if request.headers.get(k)}
-        kwargs.update(header_kwargs)
+        headers = request.headers
+        for k in ctx.header_names:
+            v = headers.get(k)
+            if v:
+                kwargs[k] = v
 
         # body
-        if request.method != "GET":
-            form_kwargs = {k: request.form.get(k) for k in self.convert_alias_to_name(aliases["form"], variables) if request.form.get(k)}
-            file_kwargs = {k: request.files.get(k) for k in self.convert_alias_to_name(aliases["file"], variables) if request.files.get(k)}
-            dummy_file_kwargs = {k: "__dummy" for k in file_kwargs}
-            kwargs.update({
-                **form_kwargs,
-                **dummy_file_kwargs
-            })
-
-        empty_keys = pydantic_model.get_non_exist_var_in_kwargs(**kwargs)
-        total_body = self.count_required_body(paired_params)
-        if total_body:
-            for k in empty_keys:
-                if k in paired_params:
-                    po = paired_params[k].param_object
-
-                    # JSON body
-                    if type(po) == Body:
-                        ak = po.alias or k
-                        kwargs[k] = None
-                        if request.method != "GET":
-                            b = self.get_pydantic_from_annots(po.dtype)
-                            if b:
-                                if BaseModel.__subclasscheck__(b):
-                                    if total_body == 1:
-                                        kwargs[k] = b(**request.json)
-                                    else:
-                                        kwargs[k] = b(**request.json.get(ak, None))
-                                else:
-                                    kwargs[k] = request.json.get(ak, None)
+        if method != "GET":
+            form = request.form
+            for k in ctx.form_names:
+                v = form.get(k)
+                if v:
+                    kwargs[k] = v
+            files = request.files
+            file_kwargs = {}
+            for k in ctx.file_names:
+                v = files.get(k)
+                if v:
+                    file_kwargs[k] = v
+                    kwargs[k] = "__dummy"
+
+        if ctx.total_body:
+            body = None
+            # walk the parallel tuples in lockstep, no index arithmetic
+            for k, alias, pydantic_class in zip(ctx.body_keys, ctx.body_aliases, ctx.body_pydantic):
+                # JSON body
+                if k not in kwargs:
+                    kwargs[k] = None
+                    if method != "GET":
+                        if body is None:
+                            body = request.get_json()
+                        if pydantic_class:
+                            if ctx.total_body == 1:
+                                kwargs[k] = pydantic_class(**body)
                             else:
-                                kwargs[k] = request.json.get(ak, None)
-                            
-    
+                                kwargs[k] = pydantic_class(**body.get(alias, None))
+                        else:
+                            kwargs[k] = body.get(alias, None)
+
         # mapping the kwargs
-        valid_kwargs = pydantic_model(**kwargs)
-        valid_kwargs = self.fill_all_enum_value(valid_kwargs)
-        valid_kwargs = vars(valid_kwargs)
+        if (
+            ctx.construct_ok
+            and pydantic_model._validator_free
+            and not (ctx.required_fields - kwargs.keys())
+        ):
+            valid_kwargs = pydantic_model.construct(**kwargs)
+        else:
+            valid_kwargs = pydantic_model(**kwargs)
+        # the model instance is discarded, so its __dict__ can be handed
+        # to the view (and mutated below) without a copy; enum members
+        # were never converted here because fill_all_enum_value only
+        # transforms plain dicts, never model instances
+        valid_kwargs = valid_kwargs.__dict__
 
         # file kwargs should be placed after pydantic to make sure its not converted
-        if request.method != "GET":
+        if method != "GET" and file_kwargs:
             valid_kwargs.update(file_kwargs)
 
         return valid_kwargs
 
     def get_params_aliases(self, paired_params: Dict[str, ParamSignature]) -> Dict[str, Dict[str, str]]:
-        aliases = {
-            "path": {},
-            "header": {},
-            "query": {},
-            "body": {},
-            "form": {},
-            "file" :{}
-        }
+        # buckets are created on first use; most routes only ever touch
+        # one or two of the six
+        aliases = defaultdict(dict)
         for key, pp in paired_params.items():
-            if isinstance(pp.param_object, Path):
-                aliases["path"][key] = pp.param_object.alias or key
-            elif isinstance(pp.param_object, Header):
-                aliases["header"][key] = pp.param_object.alias or key
-            elif isinstance(pp.param_object, Query):
-                aliases["query"][key] = pp.param_object.alias or key
-            elif isinstance(pp.param_object, Body):
-                aliases["body"][key] = pp.param_object.alias or key
-            elif isinstance(pp.param_object, (Form, FormURLEncoded)):
-                aliases["form"][key] = pp.param_object.alias or key
-            elif isinstance(pp.param_object, File):
-                aliases["file"][key] = pp.param_object.alias or key
+            po = pp.param_object
+            bucket = _ALIAS_BUCKET.get(type(po))
+            if bucket is None:
+                # subclassed param object, resolve through the class tree
+                if isinstance(po, Path):
+                    bucket = _PATH
+                elif isinstance(po, Header):
+                    bucket = _HEADER
+                elif isinstance(po, Query):
+                    bucket = _QUERY
+                elif isinstance(po, Body):
+                    bucket = _BODY
+                elif isinstance(po, (Form, FormURLEncoded)):
+                    bucket = _FORM
+                elif isinstance(po, File):
+                    bucket = _FILE
+                else:
+                    continue
+            aliases[bucket][key] = po.alias or key
         return aliases
     
     def convert_alias_to_name(self, aliases: Dict[str, str], input_name: List[str]):
-        converted_name = [aliases[key] for key in input_name if key in aliases]
-        return converted_name
+        return [v for v in map(aliases.get, input_name) if v is not None]
 
     def count_required_body(self, paired_params: Dict[str, Any]) -> int:
         total = 0
         for pp in paired_params.values():
             po = pp.param_object
-            if type(po) == Body:
+            if type(po) is Body or isinstance(po, Body):
                 total += 1
         return total
 
     def check_params_in_path(self, key: str, path: str):
-        pattern = re.compile("[<]{1}"+key+"[>]{1}")
-        matched_keys = pattern.findall(path)
-        
-        if len(matched_keys) == 1:
-            return True
-        elif len(matched_keys) > 1:
+        total = path.count(f"<{key}>")
+        if total > 1:
             error = f"Invalid path. multiple '{key}' appeared in : {path}"
             raise SwaggerPathError(error)
-        return False
+        return total == 1
     
     def update_dependencies(self, stack: List[Callable]):
         for s in stack:
-            if s not in self.dependecies:
+            if s not in self._dependencies_set:
+                self._dependencies_set.add(s)
                 self.dependecies.append(s)
\ No newline at end of file
@@ -10,6 +10,21 @@ long_description = (this_directory / "README.md").read_text()
 VERSION = "0.7.10"
 DESCRIPTION = "Flask toolkits to boost your development and simplify flask, its featured with AutoSwagger"
 
+# optionally compile the request hot path with Cython
+# (set FLASK_TOOLKITS_CYTHONIZE=1 and install Cython to enable it,
+# plain python source is used when the compiled module is absent)
+ext_modules = []
+if os.environ.get("FLASK_TOOLKITS_CYTHONIZE"):
+    try:
+        from Cython.Build import cythonize
+        ext_modules = cythonize(
+            ["flask_toolkits/routing.py"],
+            language_level=3,
+            compiler_directives={"annotation_typing": False}
+        )
+    except ImportError:
+        pass
+
 # Setting up
 setup(
     name="flask-toolkits",
@@ -20,6 +35,7 @@ setup(
     long_description_content_type="text/markdown",
     long_description=long_description,
     packages=find_packages(),
+    ext_modules=ext_modules,
     install_requires=["flask>=2.0.0","werkzeug>=2.0.0","flask-http-middleware", "pydantic", "python-jose"],
     keywords=['flask', 'middleware', 'http', 'request', "response", "swagger", "openapi", "toolkit"],
     include_package_data=True,